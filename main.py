@@ -1,22 +1,211 @@
 import click
+import dataclasses
+import functools
 import json
+import os
+import subprocess
+import sys
+import threading
 from pathlib import Path
-from strategies import GitStrategy
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
-def load_config(config_path: Path) -> Dict[str, Any]:
+# JSON types accepted for each config option, and how to describe them in errors
+CONFIG_FIELD_TYPES: Dict[str, Tuple[Tuple[type, ...], str]] = {
+    'repo_path': ((str,), "a string"),
+    'commits': ((int,), "an integer"),
+    'days_spread': ((int,), "an integer"),
+    'authors': ((list, type(None)), "a list"),
+    'push': ((bool,), "true or false"),
+    'remote': ((str,), "a string"),
+    'branch': ((str,), "a string"),
+    'remote_url': ((str, type(None)), "a string"),
+    'fast_import_threshold': ((int,), "an integer"),
+    'seed': ((int, type(None)), "an integer"),
+}
+
+
+@dataclasses.dataclass(frozen=True)
+class CommitConfig:
+    """Typed view of commit_config.json; keys the CLI doesn't know are dropped."""
+    repo_path: str = "."
+    commits: int = 10
+    days_spread: int = 10
+    authors: Tuple[Dict[str, str], ...] = ()
+    push: bool = False
+    remote: str = "origin"
+    branch: str = "main"
+    remote_url: Optional[str] = None
+    fast_import_threshold: int = 0
+    seed: Optional[int] = None
+
+    def validate(self) -> None:
+        """Range-check the effective values, once CLI overrides have been applied."""
+        if self.commits <= 0:
+            raise ValueError("Number of commits must be positive")
+        if self.days_spread < 0:
+            raise ValueError("Days spread cannot be negative")
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> 'CommitConfig':
+        """Build a config from parsed JSON, ignoring unknown keys; ValueError if a value has the wrong type."""
+        if not isinstance(raw, dict):
+            raise ValueError("Config file must contain a JSON object")
+        fields = {k: v for k, v in raw.items() if k in cls.__dataclass_fields__}
+        for name, value in fields.items():
+            types, expected = CONFIG_FIELD_TYPES[name]
+            # JSON true/false load as bool, which would otherwise pass as an int
+            if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+                raise ValueError(f"Config option '{name}' must be {expected}, got {value!r}")
+        if 'authors' in fields:
+            fields['authors'] = tuple(fields['authors'] or ())
+        return cls(**fields)
+
+
+def load_config(config_path: Path) -> CommitConfig:
     """Load configuration from JSON file."""
     try:
-        with open(config_path, 'r') as f:
-            return json.load(f)
+        # orjson raises a json.JSONDecodeError subclass, so both parsers share the handler below
+        raw = config_path.read_bytes()
+        data = orjson.loads(raw) if orjson else json.loads(raw)
+        return CommitConfig.from_dict(data)
     except FileNotFoundError:
         click.echo(f"Config file {config_path} not found. Using defaults.", err=True)
-        return {}
+        return CommitConfig()
     except json.JSONDecodeError as e:
-        click.echo(f"Invalid JSON in config file: {e}", err=True)
-        raise click.Abort()
+        raise click.UsageError(f"Invalid JSON in config file: {e}")
+
+
+@functools.lru_cache(maxsize=8)
+def _resolve_config(
+    config_path: str,
+    mtime_ns: Optional[int],
+    repo_path: Optional[str],
+    commits: Optional[int],
+    days_spread: Optional[int]
+) -> CommitConfig:
+    """Load the config and apply CLI overrides; mtime_ns only keys the cache."""
+    overrides: Dict[str, Any] = {}
+    if repo_path is not None:
+        overrides['repo_path'] = repo_path
+    if commits is not None:
+        overrides['commits'] = commits
+    if days_spread is not None:
+        overrides['days_spread'] = days_spread
+    config = dataclasses.replace(load_config(Path(config_path)), **overrides)
+    config.validate()
+    return config
+
+
+def resolve_config(
+    config_path: Path,
+    repo_path: Optional[Path],
+    commits: Optional[int],
+    days_spread: Optional[int]
+) -> CommitConfig:
+    """Return the effective config, memoized until the config file changes."""
+    try:
+        mtime_ns: Optional[int] = os.stat(config_path).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    return _resolve_config(
+        os.fspath(config_path),
+        mtime_ns,
+        os.fspath(repo_path) if repo_path is not None else None,
+        commits,
+        days_spread
+    )
+
+
+def _write_stdout(text: str) -> None:
+    """Write text to stdout in one write and flush it, behind anything already printed."""
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+def main_impl(
+    config: Path,
+    repo_path: Optional[Path],
+    commits: Optional[int],
+    days_spread: Optional[int],
+    dry_run: bool,
+    no_cleanup: bool
+) -> None:
+    """Run GitMod with already-parsed options, without going through Click."""
+    # Load configuration with CLI overrides applied
+    try:
+        config_data = resolve_config(config, repo_path, commits, days_spread)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+    final_repo_path = Path(config_data.repo_path)
+    final_commits = config_data.commits
+    final_days_spread = config_data.days_spread
+    
+    # CLI values are range-checked by Click and config values by CommitConfig;
+    # only a repo_path coming from the config file still needs checking here.
+    # Listing it once also tells GitStrategy whether .git exists.
+    try:
+        with os.scandir(final_repo_path) as it:
+            repo_entries = {entry.name for entry in it}
+    except FileNotFoundError:
+        raise click.UsageError(f"Repository path does not exist: {final_repo_path}")
+    except NotADirectoryError:
+        raise click.UsageError(f"Repository path is not a directory: {final_repo_path}")
+    except OSError as e:
+        raise click.UsageError(f"Cannot read repository path {final_repo_path}: {e}")
+    
+    if dry_run:
+        click.echo(f"Would create {final_commits} commits in {final_repo_path}")
+        click.echo(f"Spread over {final_days_spread} days")
+        if config_data.authors:
+            click.echo(f"Using {len(config_data.authors)} authors from config")
+        if config_data.push:
+            click.echo(f"Would push to {config_data.remote}/{config_data.branch}")
+        return
+    
+    # Imported here so --help and --dry-run don't pay for GitPython
+    from strategies import GitStrategy
+    from git.exc import GitError, InvalidGitRepositoryError
+    
+    try:
+        # Initialize strategy with config
+        strategy = GitStrategy(os.fspath(final_repo_path), dataclasses.asdict(config_data), repo_entries)
+
+        # Run the strategy
+        strategy.run(days_ago=final_days_spread, commits=final_commits, cleanup=not no_cleanup)
+    except InvalidGitRepositoryError as e:
+        raise click.UsageError(str(e))
+    except (OSError, subprocess.CalledProcessError, GitError) as e:
+        raise click.ClickException(str(e))
+    
+    # Start the network-bound push before reporting, and collect its outcome afterwards
+    push_errors: List[Exception] = []
+    push_thread = None
+    if config_data.push:
+        def push() -> None:
+            try:
+                strategy.push_to_remote(remote=config_data.remote, branch=config_data.branch)
+            except Exception as e:
+                push_errors.append(e)
+        
+        push_thread = threading.Thread(target=push)
+        push_thread.start()
+    
+    # Report success while the push runs, after anything the strategy printed
+    _write_stdout(f"Successfully created {final_commits} commits in {final_repo_path}\n")
+    
+    # Handle push if configured
+    if push_thread is not None:
+        push_thread.join()
+        if push_errors:
+            click.echo(f"Failed to push changes: {push_errors[0]}", err=True)
+        else:
+            _write_stdout(f"Pushed changes to {config_data.remote}/{config_data.branch}\n")
 
 
 @click.command()
@@ -24,7 +213,7 @@ def load_config(config_path: Path) -> Dict[str, Any]:
     '--config', 
     '-c', 
     default='commit_config.json', 
-    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    type=click.Path(file_okay=True, dir_okay=False, path_type=Path),
     help='Path to configuration file (default: commit_config.json)'
 )
 @click.option(
@@ -35,12 +224,12 @@ def load_config(config_path: Path) -> Dict[str, Any]:
 )
 @click.option(
     '--commits', 
-    type=int, 
+    type=click.IntRange(min=1), 
     help='Override number of commits from config'
 )
 @click.option(
     '--days-spread', 
-    type=int, 
+    type=click.IntRange(min=0), 
     help='Override days spread from config'
 )
 @click.option(
@@ -67,59 +256,7 @@ def main(
     This tool creates fake commits in a git repository with smart, conventional
     commit messages. Configuration is loaded from commit_config.json by default.
     """
-    try:
-        # Load configuration
-        config_data = load_config(config)
-        
-        # Apply CLI overrides
-        final_repo_path = repo_path or Path(config_data.get('repo_path', '.'))
-        final_commits = commits or config_data.get('commits', 10)
-        final_days_spread = days_spread or config_data.get('days_spread', 10)
-        
-        # Validate configuration
-        if not final_repo_path.exists():
-            click.echo(f"Repository path does not exist: {final_repo_path}", err=True)
-            raise click.Abort()
-        
-        if final_commits <= 0:
-            click.echo("Number of commits must be positive", err=True)
-            raise click.Abort()
-        
-        if final_days_spread < 0:
-            click.echo("Days spread cannot be negative", err=True)
-            raise click.Abort()
-        
-        if dry_run:
-            click.echo(f"Would create {final_commits} commits in {final_repo_path}")
-            click.echo(f"Spread over {final_days_spread} days")
-            if config_data.get('authors'):
-                click.echo(f"Using {len(config_data['authors'])} authors from config")
-            if config_data.get('push'):
-                click.echo(f"Would push to {config_data.get('remote', 'origin')}/{config_data.get('branch', 'main')}")
-            return
-        
-        # Initialize strategy with config
-        strategy = GitStrategy(str(final_repo_path), config_data)
-
-        # Run the strategy
-        strategy.run(days_ago=final_days_spread, commits=final_commits, cleanup=not no_cleanup)
-        
-        click.echo(f"Successfully created {final_commits} commits in {final_repo_path}")
-        
-        # Handle push if configured
-        if config_data.get('push', False):
-            try:
-                strategy.push_to_remote(
-                    remote=config_data.get('remote', 'origin'),
-                    branch=config_data.get('branch', 'main')
-                )
-                click.echo(f"Pushed changes to {config_data.get('remote', 'origin')}/{config_data.get('branch', 'main')}")
-            except Exception as e:
-                click.echo(f"Failed to push changes: {e}", err=True)
-        
-    except Exception as e:
-        click.echo(f"Error: {e}", err=True)
-        raise click.Abort()
+    main_impl(config, repo_path, commits, days_spread, dry_run, no_cleanup)
 
 
 if __name__ == "__main__":
@@ -1,19 +1,562 @@
-from faker import Faker
 from git import Repo, Actor
+from git.exc import GitCommandError, InvalidGitRepositoryError
+from git.index.typ import BaseIndexEntry
+from gitdb import IStream
+from collections import namedtuple
+from io import BytesIO
+import bisect
+import functools
+import itertools
+import json
 import os
 import random
 import re
-from datetime import datetime, timedelta
-from pathlib import Path
-from typing import List, Dict, Tuple, Optional, Any
-import difflib
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import List, Dict, Tuple, Optional, Any, Union, Set, Iterator
+
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+
+# Directories never worth scanning when git itself can't list the files
+SKIP_DIRS = frozenset({'.git', 'node_modules', '__pycache__', 'dist', 'build', '.venv', 'venv', '.tox'})
+
+# Changed files plus the facts about them that commit message generation looks at
+_ChangeSet = namedtuple('_ChangeSet', 'changes categories file_count has_python_tests has_python_models')
+
+# Extension groups used to pick a commit type; edited .rst files don't count as docs
+CODE_EXTS = frozenset({'.py', '.js', '.ts'})
+DOC_EXTS = frozenset({'.md', '.txt', '.rst'})
+DOC_EDIT_EXTS = frozenset({'.md', '.txt'})
+CONFIG_EXTS = frozenset({'.json', '.yaml', '.yml'})
+
+# File bodies written by the content generators, filled in with str.format_map
+PY_TEST_TEMPLATE = '''import unittest
+from unittest.mock import Mock, patch
+
+class Test{cls}(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures."""
+        pass
+    
+    def test_basic_functionality(self):
+        """Test basic functionality."""
+        self.assertTrue(True)
+    
+    def test_edge_cases(self):
+        """Test edge cases."""
+        self.assertIsNotNone(None)
+
+if __name__ == '__main__':
+    unittest.main()
+'''
+
+PY_MODEL_TEMPLATE = '''class {cls}:
+    """Model class for {name}."""
+    
+    def __init__(self):
+        self.id = None
+        self.created_at = None
+        self.updated_at = None
+    
+    def save(self):
+        """Save the model."""
+        pass
+    
+    def delete(self):
+        """Delete the model."""
+        pass
+'''
+
+PY_MODULE_TEMPLATE = '''"""
+{cls} module.
+
+This module provides functionality for {desc}.
+"""
+
+def main():
+    """Main function."""
+    print("Hello from {path}")
+
+if __name__ == "__main__":
+    main()
+'''
+
+JS_TEST_TEMPLATE = '''const {{ expect }} = require('chai');
+
+describe('{name}', () => {{
+    it('should work correctly', () => {{
+        expect(true).to.be.true;
+    }});
+    
+    it('should handle edge cases', () => {{
+        expect(null).to.be.null;
+    }});
+}});
+'''
+
+JS_MODULE_TEMPLATE = '''/**
+ * {display_name}
+ * 
+ * This module provides functionality for {desc}.
+ */
+
+function main() {{
+    console.log('Hello from {path}');
+}}
+
+module.exports = {{ main }};
+'''
+
+MD_README_TEMPLATE = '''# {title}
+
+This is the README file for the project.
+
+## Features
+
+- Feature 1
+- Feature 2
+- Feature 3
+
+## Installation
+
+```bash
+npm install
+```
+
+## Usage
+
+```javascript
+const app = require('./app');
+app.start();
+```
+
+## Contributing
+
+Please read CONTRIBUTING.md for details on our code of conduct.
+
+## License
+
+This project is licensed under the MIT License.
+'''
+
+MD_DOC_TEMPLATE = '''# {title}
+
+This document provides information about {desc}.
+
+## Overview
+
+This section contains important information about the project.
+
+## Details
+
+- Point 1
+- Point 2
+- Point 3
+
+Generated in commit {commit_index}.
+'''
+
+PACKAGE_JSON_CONTENT = '''{
+  "name": "my-project",
+  "version": "1.0.0",
+  "description": "A sample project",
+  "main": "index.js",
+  "scripts": {
+    "test": "jest",
+    "start": "node index.js"
+  },
+  "dependencies": {
+    "express": "^4.17.1"
+  },
+  "devDependencies": {
+    "jest": "^27.0.0"
+  }
+}'''
+
+CONFIG_TEMPLATE = '''# Configuration file for {path}
+# Generated in commit {commit_index}
+
+setting1 = value1
+setting2 = value2
+setting3 = value3
+'''
+
+GENERIC_TEMPLATE = "# {path}\n\nContent added in commit {commit_index}\nGenerated at {now}\n"
+
+# Base names of generated files as (stem, extension), for commit indexes below each limit
+# in FILE_BUCKET_LIMITS and then for every later commit
+FILE_BUCKET_LIMITS = (3, 8, 12, 15)
+FILE_BUCKETS = (
+    # Initial setup files
+    (('setup', '.py'), ('requirements', '.txt'), ('README', '.md'), ('config', '.py'), ('main', '.py')),
+    # Core functionality files
+    (('app', '.py'), ('models', '.py'), ('utils', '.py'), ('helpers', '.py'), ('core', '.py')),
+    # API and database files
+    (('api', '.py'), ('routes', '.py'), ('database', '.py'), ('schema', '.py'), ('controllers', '.py')),
+    # Testing and documentation
+    (('test_app', '.py'), ('test_models', '.py'), ('docs', '.md'), ('CHANGELOG', '.md'), ('CONTRIBUTING', '.md')),
+    # Bug fixes and improvements
+    (('fix_auth', '.py'), ('optimize_db', '.py'), ('security', '.py'), ('middleware', '.py'), ('validation', '.py'))
+)
+
+# os.open flags for (re)writing a generated file; O_BINARY keeps Windows from translating newlines
+WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+
+# Index file versions GitPython can parse; others (v4, as set by feature.manyFiles) go through git
+GITPYTHON_INDEX_VERSIONS = frozenset({1, 2, 3})
+
+# Commit types _generate_commit_type can return
+COMMIT_TYPES = ('feat', 'fix', 'docs', 'refactor', 'config', 'chore')
+
+
+def _preformat_messages(table: Dict[Tuple[str, str, str], str]) -> Dict[Tuple[Any, ...], str]:
+    """Expand message templates into finished messages for every commit type, singular and plural."""
+    return {
+        (commit_type,) + key + (plural,): f"{commit_type}: {template.format(s='s' if plural else '')}"
+        for commit_type in COMMIT_TYPES
+        for key, template in table.items()
+        for plural in (False, True)
+    }
+
+
+def _preformat_defaults(table: Dict[str, str]) -> Dict[Tuple[str, str], str]:
+    """Prefix per-project fallback messages with every commit type, keyed by (commit_type, project_type)."""
+    return {
+        (commit_type, project_type): f"{commit_type}: {message}"
+        for commit_type in COMMIT_TYPES
+        for project_type, message in table.items()
+    }
+
+
+# Number of most recent commits the history analysis looks at
+HISTORY_WINDOW = 20
+
+# History analysis saved inside the git dir, reused while HEAD doesn't move
+HISTORY_CACHE_FILE = 'git-forge-cache.json'
+
+# One record of git diff --name-status -z: copies and renames ("R087") carry two paths, the rest one
+NAME_STATUS_RE = re.compile(rb'(?:([CR])\d*\0([^\0]*)\0([^\0]*)|([A-Z])\d*\0([^\0]*))\0')
+
+# Kinds of change in a changes dict, in the order they decide a commit message;
+# renamed entries are (old, new) pairs, the others plain paths
+CHANGE_KINDS = ('added', 'modified', 'deleted', 'renamed')
+PATH_CHANGE_KINDS = CHANGE_KINDS[:3]
+
+# Change kind recorded for each single-path diff status
+STATUS_KINDS = {'A': 'added', 'M': 'modified', 'D': 'deleted'}
+
+# Conventional-commit prefixes counted when guessing the development phase
+COMMIT_PREFIX_RE = re.compile(r'(feat|fix|docs|test|perf|refactor):')
+
+# Keywords (matched anywhere, overlaps included) that mark a feature area in history
+FEATURE_AREA_RE = re.compile(r'(?=(api|auth|database|db|ui|frontend|test|doc))')
+FEATURE_AREAS = {
+    'api': 'api',
+    'auth': 'authentication',
+    'db': 'database',
+    'database': 'database',
+    'ui': 'frontend',
+    'frontend': 'frontend',
+    'test': 'testing',
+    'doc': 'documentation',
+}
+
+
+class FastImportWriter:
+    """Write commits straight into the object database through one git fast-import process."""
+
+    def __init__(self, repo_path: Union[str, bytes], branch: str, parent: Optional[str] = None):
+        self.branch = branch
+        self._parent = parent
+        self._mark = 0
+        self._commits = 0
+        # Commands are assembled here and handed to fast-import once per commit;
+        # the buffer is cleared and reused rather than reallocated
+        self._buf = bytearray()
+        self._process = subprocess.Popen(
+            ['git', 'fast-import', '--quiet', '--date-format=raw'],
+            cwd=repo_path,
+            stdin=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+
+    @staticmethod
+    def _format_ident(actor: Actor, timestamp: int) -> bytes:
+        """Format an author/committer line value in fast-import's raw date format."""
+        offset = time.localtime(timestamp).tm_gmtoff // 60
+        sign = '+' if offset >= 0 else '-'
+        offset = abs(offset)
+        return f"{actor.name} <{actor.email}> {timestamp} {sign}{offset // 60:02d}{offset % 60:02d}".encode('utf-8')
+
+    def blob(self, content: bytes) -> int:
+        """Queue a blob and return the mark commits can refer to it by."""
+        self._mark += 1
+        buf = self._buf
+        buf += b"blob\nmark :%d\ndata %d\n" % (self._mark, len(content))
+        buf += content
+        buf += b"\n"
+        return self._mark
+
+    def commit(self, message: str, author: Actor, committer: Actor, when: int, files: Dict[str, bytes]) -> None:
+        """Queue a commit adding or replacing the given files on top of the branch."""
+        blobs = [(path, self.blob(content)) for path, content in files.items()]
+        self._mark += 1
+        data = f"{message}\n".encode('utf-8')
+        buf = self._buf
+        buf += f"commit refs/heads/{self.branch}\nmark :{self._mark}\n".encode('utf-8')
+        buf += b"author " + self._format_ident(author, when) + b"\n"
+        buf += b"committer " + self._format_ident(committer, when) + b"\n"
+        buf += b"data %d\n" % len(data)
+        buf += data
+        buf += b"\n"
+        if self._commits == 0 and self._parent:
+            buf += f"from {self._parent}\n".encode('utf-8')
+        for path, mark in blobs:
+            buf += f"M 100644 :{mark} {path}\n".encode('utf-8')
+        self._flush()
+        self._commits += 1
+
+    def _flush(self) -> None:
+        """Hand the buffered commands to fast-import and empty the buffer for reuse."""
+        self._process.stdin.write(self._buf)
+        self._buf.clear()
+
+    def abort(self) -> None:
+        """Kill fast-import before the stream ends, so the branch is left where it was."""
+        self._process.kill()
+        self._process.wait()
+        for pipe in (self._process.stdin, self._process.stderr):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        """Finish the stream and wait for fast-import to update the branch."""
+        if self._buf:
+            self._flush()
+        _, stderr = self._process.communicate()
+        if self._process.returncode != 0:
+            raise GitCommandError(self._process.args, self._process.returncode, stderr)
 
 
 class GitStrategy:
-    def __init__(self, repo_path: str, config: Optional[Dict[str, Any]] = None):
-        self.repo = Repo(repo_path)
-        self.fake = Faker()
+    # Commit message pools for _generate_realistic_commit_message, by category
+    _COMMIT_PATTERNS = MappingProxyType({
+        'initial_setup': (
+            "feat: initialize project structure",
+            "feat: set up basic project configuration",
+            "feat: create initial project skeleton",
+            "feat: add project foundation",
+            "feat: bootstrap project setup"
+        ),
+        'core_features': (
+            "feat: implement core functionality",
+            "feat: add main application logic",
+            "feat: create primary business logic",
+            "feat: implement key features",
+            "feat: add essential functionality"
+        ),
+        'api_development': (
+            "feat: add REST API endpoints",
+            "feat: implement API routes",
+            "feat: create API controllers",
+            "feat: add API middleware",
+            "feat: implement API authentication"
+        ),
+        'database': (
+            "feat: add database models",
+            "feat: implement data persistence",
+            "feat: create database schema",
+            "feat: add ORM configuration",
+            "feat: implement data access layer"
+        ),
+        'frontend': (
+            "feat: add user interface components",
+            "feat: implement frontend views",
+            "feat: create responsive design",
+            "feat: add client-side functionality",
+            "feat: implement user interactions"
+        ),
+        'testing': (
+            "test: add unit tests",
+            "test: implement integration tests",
+            "test: add test coverage",
+            "test: create test suite",
+            "test: add automated tests"
+        ),
+        'documentation': (
+            "docs: add API documentation",
+            "docs: update README with usage examples",
+            "docs: add code comments",
+            "docs: create user guide",
+            "docs: add deployment instructions"
+        ),
+        'configuration': (
+            "config: update environment settings",
+            "config: add deployment configuration",
+            "config: update build settings",
+            "config: add CI/CD configuration",
+            "config: update package dependencies"
+        ),
+        'bug_fixes': (
+            "fix: resolve authentication issue",
+            "fix: correct data validation error",
+            "fix: fix API response format",
+            "fix: resolve database connection issue",
+            "fix: correct frontend rendering bug"
+        ),
+        'performance': (
+            "perf: optimize database queries",
+            "perf: improve API response time",
+            "perf: optimize frontend performance",
+            "perf: reduce memory usage",
+            "perf: improve loading speed"
+        ),
+        'refactoring': (
+            "refactor: improve code structure",
+            "refactor: extract common utilities",
+            "refactor: reorganize project layout",
+            "refactor: simplify complex logic",
+            "refactor: improve code readability"
+        ),
+        'security': (
+            "security: add input validation",
+            "security: implement proper authentication",
+            "security: fix security vulnerabilities",
+            "security: add data encryption",
+            "security: improve access controls"
+        )
+    })
+    
+    # Extra candidates mixed into the pool for the detected project type and recent focus
+    _PROJECT_EXTRAS = MappingProxyType({
+        'python_app': (
+            "feat: add Python package structure",
+            "feat: implement Python modules",
+            "feat: add Python dependencies"
+        ),
+        'web_app': (
+            "feat: add web framework setup",
+            "feat: implement web routes",
+            "feat: add web templates"
+        ),
+        'node_app': (
+            "feat: add Node.js package setup",
+            "feat: implement Express routes",
+            "feat: add npm dependencies"
+        )
+    })
+    _FOCUS_EXTRAS = MappingProxyType({
+        'api': (
+            "feat: extend API functionality",
+            "feat: add new API endpoint",
+            "feat: improve API response handling"
+        ),
+        'testing': (
+            "test: add more test coverage",
+            "test: improve test reliability",
+            "test: add edge case tests"
+        ),
+        'documentation': (
+            "docs: improve existing documentation",
+            "docs: add missing documentation",
+            "docs: update API documentation"
+        )
+    })
+    
+    # Contextual commit messages. For each project type, changed-file categories are checked
+    # in priority order and the first one present picks the message for the kind of change;
+    # {s} pluralizes by the number of files. Unknown project types use the 'generic' rules.
+    _MESSAGE_PRIORITY = MappingProxyType({
+        'python_app': ('python', 'docs', 'config'),
+        'web_app': ('python', 'html', 'css'),
+        'node_app': ('javascript', 'config'),
+        'frontend_app': ('javascript', 'css', 'html'),
+        'generic': ('python', 'javascript', 'docs', 'config')
+    })
+    _MESSAGE_TABLE = MappingProxyType({
+        ('python_app', 'added', 'python'): "add Python module{s}",
+        ('python_app', 'added', 'python_test'): "add test{s}",
+        ('python_app', 'added', 'python_model'): "add model{s}",
+        ('python_app', 'added', 'docs'): "add documentation",
+        ('python_app', 'added', 'config'): "add configuration",
+        ('python_app', 'modified', 'python'): "update Python code",
+        ('python_app', 'modified', 'python_test'): "update test{s}",
+        ('python_app', 'modified', 'docs'): "update documentation",
+        ('python_app', 'modified', 'config'): "update configuration",
+        ('web_app', 'added', 'python'): "add view{s}",
+        ('web_app', 'added', 'html'): "add template{s}",
+        ('web_app', 'added', 'css'): "add style{s}",
+        ('web_app', 'modified', 'python'): "update view{s}",
+        ('web_app', 'modified', 'html'): "update template{s}",
+        ('web_app', 'modified', 'css'): "update style{s}",
+        ('node_app', 'added', 'javascript'): "add JavaScript module{s}",
+        ('node_app', 'added', 'config'): "add package configuration",
+        ('node_app', 'modified', 'javascript'): "update JavaScript code",
+        ('node_app', 'modified', 'config'): "update package configuration",
+        ('frontend_app', 'added', 'javascript'): "add component{s}",
+        ('frontend_app', 'added', 'css'): "add style{s}",
+        ('frontend_app', 'added', 'html'): "add page{s}",
+        ('frontend_app', 'modified', 'javascript'): "update component{s}",
+        ('frontend_app', 'modified', 'css'): "update style{s}",
+        ('frontend_app', 'modified', 'html'): "update page{s}",
+        ('generic', 'added', 'python'): "add Python module{s}",
+        ('generic', 'added', 'javascript'): "add JavaScript component{s}",
+        ('generic', 'added', 'docs'): "add documentation",
+        ('generic', 'added', 'config'): "add configuration file{s}",
+        ('generic', 'added', 'other'): "add new file{s}",
+        ('generic', 'modified', 'python'): "update Python code",
+        ('generic', 'modified', 'javascript'): "update JavaScript code",
+        ('generic', 'modified', 'docs'): "update documentation",
+        ('generic', 'modified', 'config'): "update configuration",
+        ('generic', 'modified', 'other'): "update file{s}",
+        ('generic', 'deleted', 'other'): "remove unused file{s}",
+        ('generic', 'renamed', 'other'): "rename file{s}"
+    })
+    # The table above rendered for every commit type, keyed by (commit_type, *key, plural)
+    _FORMATTED_MESSAGES = MappingProxyType(_preformat_messages(_MESSAGE_TABLE))
+    # Used when no rule above matches
+    _DEFAULT_MESSAGES = MappingProxyType({
+        'python_app': "update Python project",
+        'web_app': "update web application",
+        'node_app': "update Node.js application",
+        'frontend_app': "update frontend application",
+        'generic': "update repository"
+    })
+    _FORMATTED_DEFAULTS = MappingProxyType(_preformat_defaults(_DEFAULT_MESSAGES))
+    
+    def __init__(
+        self,
+        repo_path: str,
+        config: Optional[Dict[str, Any]] = None,
+        entries: Optional[Set[str]] = None
+    ):
+        """Open repo_path, initializing it first if needed; entries is an optional listing of it."""
+        self._fake = None
+        self._authors: Optional[Tuple[Actor, ...]] = None
+        # HH:MM:SS suffix for generated file names and the second it was formatted for
+        self._stamp_second = -1
+        self._stamp = ''
+        # Every file name generated so far, and the retry suffix counter for repeats
+        self._issued_names: Set[str] = set()
+        self._name_counter = itertools.count(1)
+        # Progress lines for the current run, written to stdout in one go when it ends
+        self._log: List[str] = []
+        # Commit times are counted back from this Unix time
+        self._base_epoch = int(time.time())
+        # Environment for git commit when the index has to go through the CLI, copied once
+        self._commit_env = dict(os.environ)
         self.config = config or {}
+        # One generator per instance; a configured seed makes runs reproducible
+        self._rng = random.Random(self.config.get('seed'))
         # Conventional commit types and their common patterns
         self.commit_types = {
             'feat': ['add', 'create', 'implement', 'introduce', 'new'],
@@ -38,73 +581,144 @@ class GitStrategy:
             'docs': ['.md', '.txt', '.rst'],
             'data': ['.csv', '.xml', '.sql', '.db']
         }
+        # Inverted once so categorizing a file is a single dict lookup
+        self._ext_to_category = {ext: cat for cat, exts in self.file_patterns.items() for ext in exts}
 
-    def _get_file_extension(self, file_path: str) -> str:
-        """Get file extension from path."""
-        return Path(file_path).suffix.lower()
+        # Repository analysis is expensive; computed once and reused until invalidated
+        self._structure_cache: Optional[Dict[str, Any]] = None
+        self._history_cache: Optional[Dict[str, Any]] = None
+        
+        # Turn a plain directory into a repository before opening it, unless it already
+        # belongs to an enclosing work tree
+        has_git = '.git' in entries if entries is not None else os.path.exists(os.path.join(repo_path, '.git'))
+        if not has_git:
+            try:
+                outer = Repo(repo_path, search_parent_directories=True)
+            except InvalidGitRepositoryError:
+                self._bootstrap_repo(repo_path)
+            else:
+                raise InvalidGitRepositoryError(
+                    f"{repo_path} is inside the repository at {outer.working_dir}; "
+                    f"point repo_path at its top-level directory"
+                )
+        self.repo = Repo(repo_path)
+        # Working tree path, looked up once; encoded too so every subprocess gets its cwd
+        # without re-encoding it
+        self._workdir = self.repo.working_dir
+        self._repo_bytes = os.fsencode(self._workdir)
+        # Optional libgit2 handle, used to read diffs without spawning git; opened on first
+        # use, and not retried once libgit2 has failed to open the repository
+        self._pg = None
+        self._pg_failed = pygit2 is None
+
+    @property
+    def fake(self):
+        """Faker instance, created on first use since importing Faker is slow."""
+        if self._fake is None:
+            from faker import Faker
+            self._fake = Faker()
+        return self._fake
+
+    def _bootstrap_repo(self, repo_path: str) -> None:
+        """Initialize a repository on the configured branch, with the remote if one is given."""
+        branch = self.config.get('branch', 'main')
+        commands = [
+            ['git', 'init', '-q'],
+            ['git', 'symbolic-ref', 'HEAD', f'refs/heads/{branch}'],
+        ]
+        if self.config.get('remote_url'):
+            commands.append(['git', 'remote', 'add', self.config.get('remote', 'origin'), self.config['remote_url']])
+        for cmd in commands:
+            self._run_git(cmd, cwd=repo_path)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _get_file_extension(file_path: str) -> str:
+        """Get file extension from path (same rules as Path.suffix, without building a Path)."""
+        name = file_path[max(file_path.rfind('/'), file_path.rfind('\\')) + 1:]
+        dot = name.rfind('.')
+        return name[dot:].lower() if 0 < dot < len(name) - 1 else ''
 
     def _categorize_files(self, files: List[str]) -> Dict[str, List[str]]:
         """Categorize files by type."""
         categories = {cat: [] for cat in self.file_patterns.keys()}
         categories['other'] = []
         
+        ext_to_category = self._ext_to_category
         for file_path in files:
-            ext = self._get_file_extension(file_path)
-            categorized = False
-            
-            for category, extensions in self.file_patterns.items():
-                if ext in extensions:
-                    categories[category].append(file_path)
-                    categorized = True
-                    break
-            
-            if not categorized:
-                categories['other'].append(file_path)
+            categories[ext_to_category.get(self._get_file_extension(file_path), 'other')].append(file_path)
         
         return categories
 
     def _analyze_changes(self) -> Dict[str, any]:
         """Analyze the current changes in the repository."""
         try:
-            # Get staged changes
-            diff = self.repo.git.diff('--cached', '--name-status')
-            if not diff.strip():
-                # Get unstaged changes
-                diff = self.repo.git.diff('--name-status')
+            entries = self._read_name_status_pygit2()
+            if entries is None:
+                entries = self._read_name_status_git()
             
-            if not diff.strip():
+            if not entries:
                 # If no changes, create a dummy file
                 return self._create_dummy_changes()
             
-            changes = {
-                'added': [],
-                'modified': [],
-                'deleted': [],
-                'renamed': []
-            }
+            changes = {kind: [] for kind in CHANGE_KINDS}
+            changes['docs_added'] = 0
             
-            for line in diff.strip().split('\n'):
-                if not line.strip():
+            for status, file_path, new_path in entries:
+                if status == 'R':
+                    changes['renamed'].append((file_path, new_path))
+                    continue
+                kind = STATUS_KINDS.get(status)
+                if kind is None:
                     continue
-                    
-                parts = line.split('\t')
-                if len(parts) >= 2:
-                    status, file_path = parts[0], parts[1]
-                    
-                    if status == 'A':
-                        changes['added'].append(file_path)
-                    elif status == 'M':
-                        changes['modified'].append(file_path)
-                    elif status == 'D':
-                        changes['deleted'].append(file_path)
-                    elif status == 'R' and len(parts) >= 3:
-                        changes['renamed'].append((file_path, parts[2]))
+                changes[kind].append(file_path)
+                if kind == 'added' and self._get_file_extension(file_path) in DOC_EXTS:
+                    changes['docs_added'] += 1
             
             return changes
             
         except Exception:
             return self._create_dummy_changes()
 
+    def _read_name_status_git(self) -> List[Tuple[str, str, Optional[str]]]:
+        """Staged (else unstaged) changes from git diff --name-status as (status, path, new_path) tuples."""
+        # Get staged changes, falling back to unstaged ones; -z keeps paths unquoted
+        diff = self.repo.git.diff('--cached', '--name-status', '-z', stdout_as_string=False)
+        if not diff:
+            diff = self.repo.git.diff('--name-status', '-z', stdout_as_string=False)
+        entries = []
+        for match in NAME_STATUS_RE.finditer(diff):
+            if match.group(1):
+                entries.append((match.group(1).decode(), os.fsdecode(match.group(2)), os.fsdecode(match.group(3))))
+            else:
+                entries.append((match.group(4).decode(), os.fsdecode(match.group(5)), None))
+        return entries
+
+    def _read_name_status_pygit2(self) -> Optional[List[Tuple[str, str, str]]]:
+        """Staged (else unstaged) changes as --name-status style (status, path, new_path) tuples.
+        
+        Returns None when pygit2 is not installed, can't open the repository, or HEAD has no
+        commit to diff the index against yet; git diff handles those instead.
+        """
+        if self._pg is None:
+            if self._pg_failed:
+                return None
+            try:
+                self._pg = pygit2.Repository(self._workdir)
+            except pygit2.GitError:
+                self._pg_failed = True
+                return None
+        if self._pg.head_is_unborn:
+            return None
+        index = self._pg.index
+        # Commits are made by git itself, so pick up the index it left on disk
+        index.read()
+        diff = index.diff_to_tree(self._pg.head.peel().tree)
+        if not len(diff):
+            diff = self._pg.diff()
+        diff.find_similar()
+        return [(d.status_char(), d.old_file.path, d.new_file.path) for d in diff.deltas]
+
     def _create_dummy_changes(self) -> Dict[str, any]:
         """Create dummy changes when no real changes exist."""
         dummy_files = [
@@ -116,7 +730,7 @@ class GitStrategy:
         ]
         
         return {
-            'added': [random.choice(dummy_files)],
+            'added': [self._rng.choice(dummy_files)],
             'modified': [],
             'deleted': [],
             'renamed': []
@@ -124,34 +738,49 @@ class GitStrategy:
 
     def _generate_commit_type(self, changes: Dict[str, any]) -> str:
         """Determine commit type based on changes."""
-        if changes['added']:
-            # Check if it's documentation
-            docs_files = [f for f in changes['added'] if self._get_file_extension(f) in ['.md', '.txt', '.rst']]
-            if docs_files and len(docs_files) == len(changes['added']):
-                return 'docs'
-            return 'feat'
+        added = changes['added']
+        if added:
+            # Check if it's documentation; _analyze_changes counts these while parsing the diff,
+            # otherwise the first non-doc file settles it
+            docs_added = changes.get('docs_added')
+            if docs_added is None:
+                all_docs = all(self._get_file_extension(f) in DOC_EXTS for f in added)
+            else:
+                all_docs = docs_added == len(added)
+            return 'docs' if all_docs else 'feat'
         
         if changes['deleted']:
             return 'refactor'
         
         if changes['modified']:
             # Check for specific patterns
-            modified_files = changes['modified']
-            for file_path in modified_files:
+            for file_path in changes['modified']:
                 ext = self._get_file_extension(file_path)
-                if ext in ['.py', '.js', '.ts']:
+                if ext in CODE_EXTS:
                     return 'fix'
-                elif ext in ['.md', '.txt']:
+                elif ext in DOC_EDIT_EXTS:
                     return 'docs'
-                elif ext in ['.json', '.yaml', '.yml']:
+                elif ext in CONFIG_EXTS:
                     return 'config'
             
             return 'fix'
         
         return 'chore'
 
+    def _single_add_commit_type(self, file_path: str) -> str:
+        """Commit type for a change that only adds file_path, without building a changes dict."""
+        return 'docs' if self._get_file_extension(file_path) in DOC_EXTS else 'feat'
+
+    def invalidate_structure_cache(self) -> None:
+        """Forget the cached repository structure and commit history analysis."""
+        self._structure_cache = None
+        self._history_cache = None
+
     def _analyze_repository_structure(self) -> Dict[str, any]:
         """Analyze the existing repository structure to understand the project."""
+        if self._structure_cache is not None:
+            return self._structure_cache
+        
         structure = {
             'file_types': {},
             'directories': [],
@@ -161,56 +790,23 @@ class GitStrategy:
             'main_language': None,
             'project_type': 'unknown',
             'commit_history': [],
-            'development_phase': 'initial'
+            'development_phase': 'initial',
+            # Which project-type markers (python, web, package_json, frontend) appear in file names
+            'project_markers': set(),
+            # Tracked plus untracked-but-not-ignored file names
+            'files': set()
         }
         
         try:
-            # Get all files in the repository
-            all_files = []
-            for root, dirs, files in os.walk(self.repo.working_dir):
-                # Skip .git directory
-                if '.git' in root:
-                    continue
-                    
-                for file in files:
-                    file_path = os.path.relpath(os.path.join(root, file), self.repo.working_dir)
-                    all_files.append(file_path)
-            
-            # Analyze file types
-            for file_path in all_files:
-                ext = self._get_file_extension(file_path)
-                if ext:
-                    structure['file_types'][ext] = structure['file_types'].get(ext, 0) + 1
-            
-            # Determine main language
-            lang_counts = {
-                'python': structure['file_types'].get('.py', 0),
-                'javascript': structure['file_types'].get('.js', 0) + structure['file_types'].get('.ts', 0),
-                'java': structure['file_types'].get('.java', 0),
-                'cpp': structure['file_types'].get('.cpp', 0) + structure['file_types'].get('.c', 0),
-                'go': structure['file_types'].get('.go', 0),
-                'rust': structure['file_types'].get('.rs', 0)
-            }
-            
-            if lang_counts:
-                structure['main_language'] = max(lang_counts, key=lang_counts.get)
+            # Tracked plus untracked-but-not-ignored files: skips .git, build output and
+            # anything else .gitignore excludes without walking into it
+            try:
+                all_files = self.repo.git.ls_files('-z', '--cached', '--others', '--exclude-standard').split('\0')
+            except GitCommandError:
+                all_files = self._walk_working_tree()
             
-            # Check for common project patterns
-            structure['has_tests'] = any('test' in f.lower() or 'spec' in f.lower() for f in all_files)
-            structure['has_docs'] = any(f.endswith(('.md', '.txt', '.rst')) for f in all_files)
-            structure['has_config'] = any(f.endswith(('.json', '.yaml', '.yml', '.toml', '.ini')) for f in all_files)
-            
-            # Determine project type
-            if structure['main_language'] == 'python':
-                if any('requirements' in f.lower() or 'setup.py' in f for f in all_files):
-                    structure['project_type'] = 'python_app'
-                elif any('django' in f.lower() or 'flask' in f.lower() for f in all_files):
-                    structure['project_type'] = 'web_app'
-            elif structure['main_language'] == 'javascript':
-                if any('package.json' in f for f in all_files):
-                    structure['project_type'] = 'node_app'
-                elif any('react' in f.lower() or 'vue' in f.lower() for f in all_files):
-                    structure['project_type'] = 'frontend_app'
+            self._tally_files(structure, all_files)
+            self._classify_project(structure)
             
             # Analyze commit history to understand development phase
             structure.update(self._analyze_commit_history())
@@ -218,10 +814,124 @@ class GitStrategy:
         except Exception:
             pass
         
+        self._structure_cache = structure
         return structure
 
+    def _tally_files(self, structure: Dict[str, Any], files: List[str]) -> None:
+        """Add files to the structure's file list, extension counts, pattern flags and project markers."""
+        file_types = structure['file_types']
+        markers = structure['project_markers']
+        for file_path in files:
+            if not file_path:
+                continue
+            structure['files'].add(file_path)
+            lower = file_path.lower()
+            
+            ext = self._get_file_extension(file_path)
+            if ext:
+                file_types[ext] = file_types.get(ext, 0) + 1
+            
+            # Check for common project patterns
+            if 'test' in lower or 'spec' in lower:
+                structure['has_tests'] = True
+            if file_path.endswith(('.md', '.txt', '.rst')):
+                structure['has_docs'] = True
+            if file_path.endswith(('.json', '.yaml', '.yml', '.toml', '.ini')):
+                structure['has_config'] = True
+            
+            # Markers used to tell project types apart
+            if 'requirements' in lower or 'setup.py' in file_path:
+                markers.add('python')
+            if 'django' in lower or 'flask' in lower:
+                markers.add('web')
+            if 'package.json' in file_path:
+                markers.add('package_json')
+            if 'react' in lower or 'vue' in lower:
+                markers.add('frontend')
+
+    @staticmethod
+    def _classify_project(structure: Dict[str, Any]) -> None:
+        """Set main_language and project_type from the tallied extension counts and markers."""
+        file_types = structure['file_types']
+        markers = structure['project_markers']
+        
+        # Determine main language
+        lang_counts = {
+            'python': file_types.get('.py', 0),
+            'javascript': file_types.get('.js', 0) + file_types.get('.ts', 0),
+            'java': file_types.get('.java', 0),
+            'cpp': file_types.get('.cpp', 0) + file_types.get('.c', 0),
+            'go': file_types.get('.go', 0),
+            'rust': file_types.get('.rs', 0)
+        }
+        structure['main_language'] = max(lang_counts, key=lang_counts.get)
+        
+        # Determine project type
+        structure['project_type'] = 'unknown'
+        if structure['main_language'] == 'python':
+            if 'python' in markers:
+                structure['project_type'] = 'python_app'
+            elif 'web' in markers:
+                structure['project_type'] = 'web_app'
+        elif structure['main_language'] == 'javascript':
+            if 'package_json' in markers:
+                structure['project_type'] = 'node_app'
+            elif 'frontend' in markers:
+                structure['project_type'] = 'frontend_app'
+
+    @staticmethod
+    def _copy_structure(structure: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a structure analysis deeply enough for _advance_structure to update it in place."""
+        return dict(
+            structure,
+            file_types=dict(structure['file_types']),
+            project_markers=set(structure['project_markers']),
+            files=set(structure['files']),
+            commit_history=list(structure['commit_history'])
+        )
+
+    def _advance_structure(
+        self,
+        structure: Dict[str, Any],
+        message: Optional[str] = None,
+        file_name: Optional[str] = None
+    ) -> None:
+        """Update a copied structure analysis as if a commit with message, adding file_name, had landed.
+        
+        Either part can be left out: a planned commit's file is on disk before its message is
+        picked, so callers add the file first and the message once it is chosen.
+        """
+        if file_name is not None and file_name not in structure['files']:
+            self._tally_files(structure, [file_name])
+            self._classify_project(structure)
+        if message is not None:
+            history = structure['commit_history']
+            history.insert(0, {'message': message.strip(), 'date': None, 'files': []})
+            del history[HISTORY_WINDOW:]
+            structure.update(self._summarize_history([c['message'] for c in history]))
+
+    def _walk_working_tree(self) -> List[str]:
+        """List working tree files relative to the repository root, pruning VCS and build directories."""
+        all_files = []
+        for root, dirs, files in os.walk(self._workdir):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            for file in files:
+                all_files.append(os.path.relpath(os.path.join(root, file), self._workdir))
+        return all_files
+
     def _analyze_commit_history(self) -> Dict[str, any]:
         """Analyze existing commit history to understand project development phase."""
+        if self._history_cache is not None:
+            return self._history_cache
+        
+        # The analysis only depends on the commits reachable from HEAD
+        head_sha = self._head_sha()
+        if head_sha is not None:
+            cached = self._read_history_file(head_sha)
+            if cached is not None:
+                self._history_cache = cached
+                return cached
+        
         analysis = {
             'commit_history': [],
             'development_phase': 'initial',
@@ -230,223 +940,230 @@ class GitStrategy:
         }
         
         try:
-            # Get recent commits (last 20)
-            commits = list(self.repo.iter_commits('HEAD', max_count=20))
+            # Get recent commits (last 20) with the names of the files they touched, in one
+            # git call; --name-only skips the patch text that commit.stats would compute
+            log = self.repo.git.log(f'-{HISTORY_WINDOW}', '--name-only', '--pretty=format:%x1e%ct%x1f%B%x1f', 'HEAD')
             
-            for commit in commits:
+            for record in log.split('\x1e')[1:]:
+                timestamp, message, files = record.split('\x1f', 2)
                 analysis['commit_history'].append({
-                    'message': commit.message.strip(),
-                    'date': commit.committed_datetime,
-                    'files': list(commit.stats.files.keys()) if commit.stats.files else []
+                    'message': message.strip(),
+                    'date': datetime.fromtimestamp(int(timestamp), timezone.utc),
+                    'files': [f for f in files.splitlines() if f]
                 })
             
             # Analyze commit patterns to determine development phase
-            messages = [c['message'] for c in analysis['commit_history']]
+            analysis.update(self._summarize_history([c['message'] for c in analysis['commit_history']]))
             
-            # Count different types of commits
-            feat_count = sum(1 for msg in messages if msg.startswith('feat:'))
-            fix_count = sum(1 for msg in messages if msg.startswith('fix:'))
-            docs_count = sum(1 for msg in messages if msg.startswith('docs:'))
-            test_count = sum(1 for msg in messages if msg.startswith('test:'))
-            perf_count = sum(1 for msg in messages if msg.startswith('perf:'))
-            refactor_count = sum(1 for msg in messages if msg.startswith('refactor:'))
-            
-            # Determine development phase based on commit patterns
-            total_commits = len(messages)
-            if total_commits < 5:
-                analysis['development_phase'] = 'initial'
-            elif feat_count > fix_count * 2:
-                analysis['development_phase'] = 'feature_development'
-            elif fix_count > feat_count:
-                analysis['development_phase'] = 'bug_fixing'
-            elif docs_count > total_commits * 0.3:
-                analysis['development_phase'] = 'documentation'
-            elif test_count > total_commits * 0.2:
-                analysis['development_phase'] = 'testing'
-            elif perf_count > 0 or refactor_count > 0:
-                analysis['development_phase'] = 'optimization'
-            else:
-                analysis['development_phase'] = 'maintenance'
-            
-            # Analyze recent focus areas
-            recent_messages = messages[:5] if messages else []
-            if any('api' in msg.lower() for msg in recent_messages):
-                analysis['recent_focus'] = 'api'
-            elif any('test' in msg.lower() for msg in recent_messages):
-                analysis['recent_focus'] = 'testing'
-            elif any('doc' in msg.lower() for msg in recent_messages):
-                analysis['recent_focus'] = 'documentation'
-            elif any('fix' in msg.lower() for msg in recent_messages):
-                analysis['recent_focus'] = 'bug_fixes'
-            elif any('perf' in msg.lower() for msg in recent_messages):
-                analysis['recent_focus'] = 'performance'
-            
-            # Extract feature areas from commit messages
-            for msg in messages:
-                if 'api' in msg.lower():
-                    analysis['feature_areas'].add('api')
-                if 'auth' in msg.lower():
-                    analysis['feature_areas'].add('authentication')
-                if 'db' in msg.lower() or 'database' in msg.lower():
-                    analysis['feature_areas'].add('database')
-                if 'ui' in msg.lower() or 'frontend' in msg.lower():
-                    analysis['feature_areas'].add('frontend')
-                if 'test' in msg.lower():
-                    analysis['feature_areas'].add('testing')
-                if 'doc' in msg.lower():
-                    analysis['feature_areas'].add('documentation')
+            if head_sha is not None:
+                self._write_history_file(head_sha, analysis)
             
         except Exception:
             pass
         
+        self._history_cache = analysis
         return analysis
 
-    def _generate_contextual_commit_message(self, changes: Dict[str, any], commit_type: str) -> str:
+    @staticmethod
+    def _summarize_history(messages: List[str]) -> Dict[str, Any]:
+        """Development phase, feature areas and recent focus implied by commit messages, newest first."""
+        summary = {
+            'development_phase': 'initial',
+            'feature_areas': set(),
+            'recent_focus': 'setup'
+        }
+        
+        # Keyword checks are case-insensitive; lowercase every message once
+        lowered = [msg.lower() for msg in messages]
+        
+        # Count commit types and extract feature areas in a single pass
+        prefix_counts = dict.fromkeys(('feat', 'fix', 'docs', 'test', 'perf', 'refactor'), 0)
+        for msg, lower_msg in zip(messages, lowered):
+            prefix = COMMIT_PREFIX_RE.match(msg)
+            if prefix:
+                prefix_counts[prefix.group(1)] += 1
+            for keyword in FEATURE_AREA_RE.findall(lower_msg):
+                summary['feature_areas'].add(FEATURE_AREAS[keyword])
+        
+        feat_count = prefix_counts['feat']
+        fix_count = prefix_counts['fix']
+        docs_count = prefix_counts['docs']
+        test_count = prefix_counts['test']
+        perf_count = prefix_counts['perf']
+        refactor_count = prefix_counts['refactor']
+        
+        # Determine development phase based on commit patterns
+        total_commits = len(messages)
+        if total_commits < 5:
+            summary['development_phase'] = 'initial'
+        elif feat_count > fix_count * 2:
+            summary['development_phase'] = 'feature_development'
+        elif fix_count > feat_count:
+            summary['development_phase'] = 'bug_fixing'
+        elif docs_count > total_commits * 0.3:
+            summary['development_phase'] = 'documentation'
+        elif test_count > total_commits * 0.2:
+            summary['development_phase'] = 'testing'
+        elif perf_count > 0 or refactor_count > 0:
+            summary['development_phase'] = 'optimization'
+        else:
+            summary['development_phase'] = 'maintenance'
+        
+        # Analyze recent focus areas
+        recent_messages = lowered[:5]
+        if any('api' in msg for msg in recent_messages):
+            summary['recent_focus'] = 'api'
+        elif any('test' in msg for msg in recent_messages):
+            summary['recent_focus'] = 'testing'
+        elif any('doc' in msg for msg in recent_messages):
+            summary['recent_focus'] = 'documentation'
+        elif any('fix' in msg for msg in recent_messages):
+            summary['recent_focus'] = 'bug_fixes'
+        elif any('perf' in msg for msg in recent_messages):
+            summary['recent_focus'] = 'performance'
+        
+        return summary
+
+    def _head_sha(self) -> Optional[str]:
+        """Commit HEAD points at, or None on an unborn branch."""
+        try:
+            return self.repo.head.commit.hexsha
+        except ValueError:
+            return None
+
+    def _read_history_file(self, head_sha: str) -> Optional[Dict[str, Any]]:
+        """Return the history analysis saved in the git dir if it was made for head_sha."""
+        try:
+            with open(os.path.join(self.repo.git_dir, HISTORY_CACHE_FILE), 'rb') as f:
+                data = json.load(f)
+            if data.get('head') != head_sha:
+                return None
+            analysis = data['analysis']
+            analysis['feature_areas'] = set(analysis['feature_areas'])
+            for commit in analysis['commit_history']:
+                commit['date'] = datetime.fromtimestamp(commit['date'], timezone.utc)
+            return analysis
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_history_file(self, head_sha: str, analysis: Dict[str, Any]) -> None:
+        """Atomically save the history analysis for head_sha; failures only cost the cache."""
+        data = {
+            'head': head_sha,
+            'analysis': dict(
+                analysis,
+                feature_areas=sorted(analysis['feature_areas']),
+                commit_history=[
+                    dict(commit, date=int(commit['date'].timestamp())) for commit in analysis['commit_history']
+                ]
+            )
+        }
+        cache_path = os.path.join(self.repo.git_dir, HISTORY_CACHE_FILE)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def _build_changeset(self, changes: Dict[str, any]) -> _ChangeSet:
+        """Categorize changed files once and derive everything the message generators ask about."""
+        categories = {cat: [] for cat in self.file_patterns.keys()}
+        categories['other'] = []
+        ext_to_category = self._ext_to_category
+        file_count = 0
+        has_tests = has_models = False
+        
+        # One pass over the changed files: categorize each and, until both are settled,
+        # check Python files for test/model names
+        for action in PATH_CHANGE_KINDS:
+            files = changes[action]
+            file_count += len(files)
+            for file_path in files:
+                category = ext_to_category.get(self._get_file_extension(file_path), 'other')
+                categories[category].append(file_path)
+                if category == 'python' and not (has_tests and has_models):
+                    lowered = file_path.lower()
+                    has_tests = has_tests or 'test' in lowered
+                    has_models = has_models or 'model' in lowered or 'class' in lowered
+        
+        return _ChangeSet(
+            changes=changes,
+            categories=categories,
+            file_count=file_count,
+            has_python_tests=has_tests,
+            has_python_models=has_models
+        )
+
+    def _snapshot_changes(self) -> _ChangeSet:
+        """Read the current working tree changes and categorize them in one go."""
+        return self._build_changeset(self._analyze_changes())
+
+    def _generate_contextual_commit_message(self, changes: Union[Dict[str, any], _ChangeSet], commit_type: str) -> str:
         """Generate a contextual commit message based on repository structure and changes."""
         structure = self._analyze_repository_structure()
-        all_files = changes['added'] + changes['modified'] + changes['deleted']
-        
-        if not all_files:
-            return f"{commit_type}: update repository"
-        
-        # Categorize files
-        categories = self._categorize_files(all_files)
-        
-        # Generate contextual messages based on project type and changes
-        if structure['project_type'] == 'python_app':
-            return self._generate_python_commit_message(changes, commit_type, categories)
-        elif structure['project_type'] == 'web_app':
-            return self._generate_web_commit_message(changes, commit_type, categories)
-        elif structure['project_type'] == 'node_app':
-            return self._generate_node_commit_message(changes, commit_type, categories)
-        elif structure['project_type'] == 'frontend_app':
-            return self._generate_frontend_commit_message(changes, commit_type, categories)
-        else:
-            return self._generate_generic_commit_message(changes, commit_type, categories)
-
-    def _generate_python_commit_message(self, changes: Dict[str, any], commit_type: str, categories: Dict[str, List[str]]) -> str:
-        """Generate Python-specific commit messages."""
-        if changes['added']:
-            if categories['python']:
-                if any('test' in f.lower() for f in categories['python']):
-                    return f"{commit_type}: add test{'s' if len(categories['python']) > 1 else ''}"
-                elif any('model' in f.lower() or 'class' in f.lower() for f in categories['python']):
-                    return f"{commit_type}: add model{'s' if len(categories['python']) > 1 else ''}"
-                else:
-                    return f"{commit_type}: add Python module{'s' if len(categories['python']) > 1 else ''}"
-            elif categories['docs']:
-                return f"{commit_type}: add documentation"
-            elif categories['config']:
-                return f"{commit_type}: add configuration"
-        
-        elif changes['modified']:
-            if categories['python']:
-                if any('test' in f.lower() for f in categories['python']):
-                    return f"{commit_type}: update test{'s' if len(categories['python']) > 1 else ''}"
-                else:
-                    return f"{commit_type}: update Python code"
-            elif categories['docs']:
-                return f"{commit_type}: update documentation"
-            elif categories['config']:
-                return f"{commit_type}: update configuration"
-        
-        return f"{commit_type}: update Python project"
-
-    def _generate_web_commit_message(self, changes: Dict[str, any], commit_type: str, categories: Dict[str, List[str]]) -> str:
-        """Generate web application commit messages."""
-        if changes['added']:
-            if categories['python']:
-                return f"{commit_type}: add view{'s' if len(categories['python']) > 1 else ''}"
-            elif categories['html']:
-                return f"{commit_type}: add template{'s' if len(categories['html']) > 1 else ''}"
-            elif categories['css']:
-                return f"{commit_type}: add style{'s' if len(categories['css']) > 1 else ''}"
-        
-        elif changes['modified']:
-            if categories['python']:
-                return f"{commit_type}: update view{'s' if len(categories['python']) > 1 else ''}"
-            elif categories['html']:
-                return f"{commit_type}: update template{'s' if len(categories['html']) > 1 else ''}"
-            elif categories['css']:
-                return f"{commit_type}: update style{'s' if len(categories['css']) > 1 else ''}"
-        
-        return f"{commit_type}: update web application"
-
-    def _generate_node_commit_message(self, changes: Dict[str, any], commit_type: str, categories: Dict[str, List[str]]) -> str:
-        """Generate Node.js application commit messages."""
-        if changes['added']:
-            if categories['javascript']:
-                return f"{commit_type}: add JavaScript module{'s' if len(categories['javascript']) > 1 else ''}"
-            elif categories['config']:
-                return f"{commit_type}: add package configuration"
-        
-        elif changes['modified']:
-            if categories['javascript']:
-                return f"{commit_type}: update JavaScript code"
-            elif categories['config']:
-                return f"{commit_type}: update package configuration"
-        
-        return f"{commit_type}: update Node.js application"
-
-    def _generate_frontend_commit_message(self, changes: Dict[str, any], commit_type: str, categories: Dict[str, List[str]]) -> str:
-        """Generate frontend application commit messages."""
-        if changes['added']:
-            if categories['javascript']:
-                return f"{commit_type}: add component{'s' if len(categories['javascript']) > 1 else ''}"
-            elif categories['css']:
-                return f"{commit_type}: add style{'s' if len(categories['css']) > 1 else ''}"
-            elif categories['html']:
-                return f"{commit_type}: add page{'s' if len(categories['html']) > 1 else ''}"
-        
-        elif changes['modified']:
-            if categories['javascript']:
-                return f"{commit_type}: update component{'s' if len(categories['javascript']) > 1 else ''}"
-            elif categories['css']:
-                return f"{commit_type}: update style{'s' if len(categories['css']) > 1 else ''}"
-            elif categories['html']:
-                return f"{commit_type}: update page{'s' if len(categories['html']) > 1 else ''}"
-        
-        return f"{commit_type}: update frontend application"
-
-    def _generate_generic_commit_message(self, changes: Dict[str, any], commit_type: str, categories: Dict[str, List[str]]) -> str:
-        """Generate generic commit messages."""
-        if changes['added']:
-            if categories['python']:
-                return f"{commit_type}: add Python module{'s' if len(categories['python']) > 1 else ''}"
-            elif categories['javascript']:
-                return f"{commit_type}: add JavaScript component{'s' if len(categories['javascript']) > 1 else ''}"
-            elif categories['docs']:
-                return f"{commit_type}: add documentation"
-            elif categories['config']:
-                return f"{commit_type}: add configuration file{'s' if len(categories['config']) > 1 else ''}"
-            else:
-                return f"{commit_type}: add new file{'s' if len(changes['added']) > 1 else ''}"
-        
-        elif changes['modified']:
-            if categories['python']:
-                return f"{commit_type}: update Python code"
-            elif categories['javascript']:
-                return f"{commit_type}: update JavaScript code"
-            elif categories['docs']:
-                return f"{commit_type}: update documentation"
-            elif categories['config']:
-                return f"{commit_type}: update configuration"
-            else:
-                return f"{commit_type}: update file{'s' if len(changes['modified']) > 1 else ''}"
+        change_set = changes if isinstance(changes, _ChangeSet) else self._build_changeset(changes)
+        
+        project_type = structure['project_type']
+        if project_type not in self._MESSAGE_PRIORITY:
+            project_type = 'generic'
+        if not change_set.file_count:
+            return self._default_message(commit_type, 'generic')
+        changes, categories = change_set.changes, change_set.categories
         
-        elif changes['deleted']:
-            return f"{commit_type}: remove unused file{'s' if len(changes['deleted']) > 1 else ''}"
+        # The first kind of change present decides the message
+        action = next((a for a in CHANGE_KINDS if changes[a]), None)
+        category = 'other'
+        count = len(changes[action]) if action else 0
+        if action in ('added', 'modified'):
+            for candidate in self._MESSAGE_PRIORITY[project_type]:
+                if categories[candidate]:
+                    category = candidate
+                    count = len(categories[candidate])
+                    break
         
-        elif changes['renamed']:
-            return f"{commit_type}: rename file{'s' if len(changes['renamed']) > 1 else ''}"
+        # Python projects tell tests and models apart from other modules
+        if project_type == 'python_app' and category == 'python':
+            if change_set.has_python_tests:
+                category = 'python_test'
+            elif action == 'added' and change_set.has_python_models:
+                category = 'python_model'
         
-        return f"{commit_type}: update repository"
+        message = self._FORMATTED_MESSAGES.get((commit_type, project_type, action, category, count > 1))
+        if message is not None:
+            return message
+        template = self._MESSAGE_TABLE.get((project_type, action, category))
+        if template is None:
+            return self._default_message(commit_type, project_type)
+        return f"{commit_type}: {template.format(s='s' if count > 1 else '')}"
+
+    def _default_message(self, commit_type: str, project_type: str) -> str:
+        """Message used when no rule matches, preformatted for the known commit types."""
+        message = self._FORMATTED_DEFAULTS.get((commit_type, project_type))
+        if message is None:
+            message = f"{commit_type}: {self._DEFAULT_MESSAGES[project_type]}"
+        return message
 
-    def _generate_commit_message(self, changes: Dict[str, any], commit_type: str) -> str:
+    def _generate_commit_message(self, changes: Union[Dict[str, any], _ChangeSet], commit_type: str) -> str:
         """Generate a contextual commit message based on repository structure and changes."""
         return self._generate_contextual_commit_message(changes, commit_type)
 
-    def _get_authors(self) -> List[Actor]:
+    @property
+    def authors(self) -> Tuple[Actor, ...]:
+        """Commit authors, parsed from the config or GIT_AUTHORS on first use."""
+        if self._authors is None:
+            self._authors = tuple(self._load_authors())
+        return self._authors
+
+    def _get_authors(self) -> Tuple[Actor, ...]:
+        """Get the authors from config or environment variable."""
+        return self.authors
+
+    def _load_authors(self) -> List[Actor]:
         """Get list of authors from config or environment variable."""
         # First try to get authors from config
         if self.config and 'authors' in self.config:
@@ -479,97 +1196,36 @@ class GitStrategy:
         except Exception:
             return [Actor("Developer", "dev@example.com")]
 
-    def _generate_realistic_commit_message(self, changes: Dict[str, any], commit_type: str, commit_index: int) -> str:
-        """Generate realistic commit messages that vary based on commit index and project context."""
-        structure = self._analyze_repository_structure()
+    def generate_messages(
+        self,
+        changes: Dict[str, any],
+        commit_type: str,
+        n: int,
+        start_index: int = 0
+    ) -> Iterator[str]:
+        """Yield n realistic commit messages for consecutive commit indexes, analyzing the repository once.
         
-        # Define realistic commit patterns based on project timeline and history
-        commit_patterns = {
-            'initial_setup': [
-                "feat: initialize project structure",
-                "feat: set up basic project configuration",
-                "feat: create initial project skeleton",
-                "feat: add project foundation",
-                "feat: bootstrap project setup"
-            ],
-            'core_features': [
-                "feat: implement core functionality",
-                "feat: add main application logic",
-                "feat: create primary business logic",
-                "feat: implement key features",
-                "feat: add essential functionality"
-            ],
-            'api_development': [
-                "feat: add REST API endpoints",
-                "feat: implement API routes",
-                "feat: create API controllers",
-                "feat: add API middleware",
-                "feat: implement API authentication"
-            ],
-            'database': [
-                "feat: add database models",
-                "feat: implement data persistence",
-                "feat: create database schema",
-                "feat: add ORM configuration",
-                "feat: implement data access layer"
-            ],
-            'frontend': [
-                "feat: add user interface components",
-                "feat: implement frontend views",
-                "feat: create responsive design",
-                "feat: add client-side functionality",
-                "feat: implement user interactions"
-            ],
-            'testing': [
-                "test: add unit tests",
-                "test: implement integration tests",
-                "test: add test coverage",
-                "test: create test suite",
-                "test: add automated tests"
-            ],
-            'documentation': [
-                "docs: add API documentation",
-                "docs: update README with usage examples",
-                "docs: add code comments",
-                "docs: create user guide",
-                "docs: add deployment instructions"
-            ],
-            'configuration': [
-                "config: update environment settings",
-                "config: add deployment configuration",
-                "config: update build settings",
-                "config: add CI/CD configuration",
-                "config: update package dependencies"
-            ],
-            'bug_fixes': [
-                "fix: resolve authentication issue",
-                "fix: correct data validation error",
-                "fix: fix API response format",
-                "fix: resolve database connection issue",
-                "fix: correct frontend rendering bug"
-            ],
-            'performance': [
-                "perf: optimize database queries",
-                "perf: improve API response time",
-                "perf: optimize frontend performance",
-                "perf: reduce memory usage",
-                "perf: improve loading speed"
-            ],
-            'refactoring': [
-                "refactor: improve code structure",
-                "refactor: extract common utilities",
-                "refactor: reorganize project layout",
-                "refactor: simplify complex logic",
-                "refactor: improve code readability"
-            ],
-            'security': [
-                "security: add input validation",
-                "security: implement proper authentication",
-                "security: fix security vulnerabilities",
-                "security: add data encryption",
-                "security: improve access controls"
-            ]
-        }
+        Each message is picked as if the ones before it had already been committed.
+        """
+        structure = self._copy_structure(self._analyze_repository_structure())
+        for commit_index in range(start_index, start_index + n):
+            message = self._generate_realistic_commit_message(changes, commit_type, commit_index, structure)
+            self._advance_structure(structure, message)
+            yield message
+
+    def _generate_realistic_commit_message(
+        self,
+        changes: Optional[Dict[str, any]],
+        commit_type: str,
+        commit_index: int,
+        structure: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Generate realistic commit messages that vary based on commit index and project context.
+        
+        The message does not depend on changes; callers with nothing to describe pass None.
+        """
+        if structure is None:
+            structure = self._analyze_repository_structure()
         
         # Determine commit category based on development phase and recent focus
         development_phase = structure.get('development_phase', 'initial')
@@ -595,321 +1251,279 @@ class GitStrategy:
         elif development_phase == 'testing':
             category = 'testing'
         elif development_phase == 'optimization':
-            category = random.choice(['performance', 'refactoring'])
+            category = self._rng.choice(['performance', 'refactoring'])
         else:
             # Fallback based on commit index
             if commit_index < 8:
                 category = 'core_features'
             elif commit_index < 12:
-                category = random.choice(['api_development', 'database', 'frontend'])
+                category = self._rng.choice(['api_development', 'database', 'frontend'])
             elif commit_index < 15:
-                category = random.choice(['testing', 'documentation', 'configuration'])
+                category = self._rng.choice(['testing', 'documentation', 'configuration'])
             else:
-                category = random.choice(['bug_fixes', 'performance', 'refactoring', 'security'])
-        
-        # Get appropriate messages for the category
-        messages = commit_patterns.get(category, commit_patterns['core_features'])
-        
-        # Add project-specific context based on existing patterns
-        if structure['project_type'] == 'python_app':
-            messages.extend([
-                "feat: add Python package structure",
-                "feat: implement Python modules",
-                "feat: add Python dependencies"
-            ])
-        elif structure['project_type'] == 'web_app':
-            messages.extend([
-                "feat: add web framework setup",
-                "feat: implement web routes",
-                "feat: add web templates"
-            ])
-        elif structure['project_type'] == 'node_app':
-            messages.extend([
-                "feat: add Node.js package setup",
-                "feat: implement Express routes",
-                "feat: add npm dependencies"
-            ])
-        
-        # Add context-specific messages based on recent commits
-        if recent_focus == 'api':
-            messages.extend([
-                "feat: extend API functionality",
-                "feat: add new API endpoint",
-                "feat: improve API response handling"
-            ])
-        elif recent_focus == 'testing':
-            messages.extend([
-                "test: add more test coverage",
-                "test: improve test reliability",
-                "test: add edge case tests"
-            ])
-        elif recent_focus == 'documentation':
-            messages.extend([
-                "docs: improve existing documentation",
-                "docs: add missing documentation",
-                "docs: update API documentation"
-            ])
-        
-        return random.choice(messages)
+                category = self._rng.choice(['bug_fixes', 'performance', 'refactoring', 'security'])
+        
+        # Get appropriate messages for the category, plus project- and focus-specific ones
+        messages = (
+            self._COMMIT_PATTERNS.get(category, self._COMMIT_PATTERNS['core_features'])
+            + self._PROJECT_EXTRAS.get(structure['project_type'], ())
+            + self._FOCUS_EXTRAS.get(recent_focus, ())
+        )
+        
+        return self._rng.choice(messages)
 
     def _create_realistic_file_content(self, file_path: str, commit_index: int) -> str:
         """Create realistic file content based on file type and commit context."""
-        ext = self._get_file_extension(file_path)
-        
-        if ext == '.py':
-            return self._generate_python_content(file_path, commit_index)
-        elif ext in ['.js', '.ts']:
-            return self._generate_javascript_content(file_path, commit_index)
-        elif ext == '.md':
-            return self._generate_markdown_content(file_path, commit_index)
-        elif ext in ['.json', '.yaml', '.yml']:
-            return self._generate_config_content(file_path, commit_index)
+        generate = self._CONTENT_GENERATORS.get(self._get_file_extension(file_path))
+        if generate is not None:
+            return generate(self, file_path, commit_index)
         else:
-            return f"# {file_path}\n\nContent added in commit {commit_index}\nGenerated at {datetime.now()}\n"
+            return GENERIC_TEMPLATE.format_map({'path': file_path, 'commit_index': commit_index, 'now': datetime.now()})
 
     def _generate_python_content(self, file_path: str, commit_index: int) -> str:
         """Generate realistic Python file content."""
-        if 'test' in file_path.lower():
-            return f'''import unittest
-from unittest.mock import Mock, patch
-
-class Test{file_path.split('/')[-1].replace('.py', '').title().replace('_', '')}(unittest.TestCase):
-    def setUp(self):
-        """Set up test fixtures."""
-        pass
-    
-    def test_basic_functionality(self):
-        """Test basic functionality."""
-        self.assertTrue(True)
-    
-    def test_edge_cases(self):
-        """Test edge cases."""
-        self.assertIsNotNone(None)
-
-if __name__ == '__main__':
-    unittest.main()
-'''
-        elif 'model' in file_path.lower():
-            return f'''class {file_path.split('/')[-1].replace('.py', '').title().replace('_', '')}:
-    """Model class for {file_path.split('/')[-1].replace('.py', '')}."""
-    
-    def __init__(self):
-        self.id = None
-        self.created_at = None
-        self.updated_at = None
-    
-    def save(self):
-        """Save the model."""
-        pass
-    
-    def delete(self):
-        """Delete the model."""
-        pass
-'''
+        name = file_path.split('/')[-1].replace('.py', '')
+        fields = {'cls': name.title().replace('_', ''), 'name': name, 'path': file_path}
+        lowered = file_path.lower()
+        if 'test' in lowered:
+            return PY_TEST_TEMPLATE.format_map(fields)
+        elif 'model' in lowered:
+            return PY_MODEL_TEMPLATE.format_map(fields)
         else:
-            return f'''"""
-{file_path.split('/')[-1].replace('.py', '').title().replace('_', '')} module.
-
-This module provides functionality for {file_path.split('/')[-1].replace('.py', '').lower().replace('_', ' ')}.
-"""
-
-def main():
-    """Main function."""
-    print("Hello from {file_path}")
-
-if __name__ == "__main__":
-    main()
-'''
+            fields['desc'] = name.lower().replace('_', ' ')
+            return PY_MODULE_TEMPLATE.format_map(fields)
 
     def _generate_javascript_content(self, file_path: str, commit_index: int) -> str:
         """Generate realistic JavaScript file content."""
         filename = file_path.split('/')[-1].replace('.js', '').replace('.ts', '')
         if 'test' in file_path.lower():
-            return f'''const {{ expect }} = require('chai');
-
-describe('{filename}', () => {{
-    it('should work correctly', () => {{
-        expect(true).to.be.true;
-    }});
-    
-    it('should handle edge cases', () => {{
-        expect(null).to.be.null;
-    }});
-}});
-'''
+            return JS_TEST_TEMPLATE.format_map({'name': filename})
         else:
-            # Use string formatting to avoid f-string issues with curly braces
-            display_name = filename.replace('_', ' ').upper()
-            description = filename.replace('_', ' ').lower()
-            return f'''/**
- * {display_name}
- * 
- * This module provides functionality for {description}.
- */
-
-function main() {{
-    console.log('Hello from {file_path}');
-}}
-
-module.exports = {{ main }};
-'''
+            words = filename.replace('_', ' ')
+            return JS_MODULE_TEMPLATE.format_map({
+                'display_name': words.upper(),
+                'desc': words.lower(),
+                'path': file_path
+            })
 
     def _generate_markdown_content(self, file_path: str, commit_index: int) -> str:
         """Generate realistic Markdown content."""
+        name = file_path.split('/')[-1].replace('.md', '')
+        title = name.title().replace('_', ' ')
         if 'readme' in file_path.lower():
-            return f'''# {file_path.split('/')[-1].replace('.md', '').title().replace('_', ' ')}
-
-This is the README file for the project.
-
-## Features
-
-- Feature 1
-- Feature 2
-- Feature 3
-
-## Installation
-
-```bash
-npm install
-```
-
-## Usage
-
-```javascript
-const app = require('./app');
-app.start();
-```
-
-## Contributing
-
-Please read CONTRIBUTING.md for details on our code of conduct.
-
-## License
-
-This project is licensed under the MIT License.
-'''
+            return MD_README_TEMPLATE.format_map({'title': title})
         else:
-            return f'''# {file_path.split('/')[-1].replace('.md', '').title().replace('_', ' ')}
-
-This document provides information about {file_path.split('/')[-1].replace('.md', '').lower().replace('_', ' ')}.
-
-## Overview
-
-This section contains important information about the project.
-
-## Details
-
-- Point 1
-- Point 2
-- Point 3
-
-Generated in commit {commit_index}.
-'''
+            return MD_DOC_TEMPLATE.format_map({
+                'title': title,
+                'desc': name.lower().replace('_', ' '),
+                'commit_index': commit_index
+            })
 
     def _generate_config_content(self, file_path: str, commit_index: int) -> str:
         """Generate realistic configuration file content."""
         if 'package.json' in file_path:
-            return '''{
-  "name": "my-project",
-  "version": "1.0.0",
-  "description": "A sample project",
-  "main": "index.js",
-  "scripts": {
-    "test": "jest",
-    "start": "node index.js"
-  },
-  "dependencies": {
-    "express": "^4.17.1"
-  },
-  "devDependencies": {
-    "jest": "^27.0.0"
-  }
-}'''
+            return PACKAGE_JSON_CONTENT
         else:
-            return f'''# Configuration file for {file_path}
-# Generated in commit {commit_index}
+            return CONFIG_TEMPLATE.format_map({'path': file_path, 'commit_index': commit_index})
 
-setting1 = value1
-setting2 = value2
-setting3 = value3
-'''
+    # Content generator per file extension, used by _create_realistic_file_content
+    _CONTENT_GENERATORS = MappingProxyType({
+        '.py': _generate_python_content,
+        '.js': _generate_javascript_content,
+        '.ts': _generate_javascript_content,
+        '.md': _generate_markdown_content,
+        '.json': _generate_config_content,
+        '.yaml': _generate_config_content,
+        '.yml': _generate_config_content
+    })
+
+    def _generate_commit_time(self, days_ago: int) -> int:
+        """Pick a random Unix time within the day before days_ago days back from the run start."""
+        return self._base_epoch - days_ago * 86400 - self._rng.randrange(86400)
 
-    def _create_commit(self, days_ago: int = 0, commit_index: int = 0) -> None:
-        """Create a commit with realistic message generation."""
-        authors = self._get_authors()
-        author = random.choice(authors)
+    def _generate_unique_filename(self, commit_index: int) -> str:
+        """Generate a realistic filename that is neither in the repository nor handed out before.
+        
+        Names carry the commit index and the time of day, which repeats from one day to the
+        next, so they are checked against the files the structure analysis already listed
+        as well as the ones generated in this process, and get a retry suffix on a clash.
+        """
+        taken = self._analyze_repository_structure()['files']
+        file_name = self._generate_realistic_filename(commit_index)
+        name, ext = os.path.splitext(file_name)
+        while file_name in self._issued_names or file_name in taken:
+            file_name = f"{name}_v{next(self._name_counter)}{ext}"
+        self._issued_names.add(file_name)
+        return file_name
+
+    def _generate_commit_plan(
+        self,
+        commits: int,
+        messages: Optional[List[str]] = None,
+        days_ago: int = 0
+    ) -> List[Tuple[str, str, Actor, int]]:
+        """Pick the file name, message, author and time of every commit before any git work starts."""
+        messages = messages or []
+        # Authors and time-of-day offsets are drawn for the whole batch in two calls
+        authors = self._rng.choices(self.authors, k=commits)
+        base = self._base_epoch - days_ago * 86400
+        times = [base - offset for offset in self._rng.choices(range(86400), k=commits)]
+        # The analysis is taken once and then advanced by every planned commit, so each
+        # message sees the history and files the commits before it will have added
+        structure = None
+        if commits > len(messages):
+            structure = self._copy_structure(self._analyze_repository_structure())
+        plan = []
+        for i in range(commits):
+            file_name = self._generate_unique_filename(i)
+            if structure is not None:
+                self._advance_structure(structure, file_name=file_name)
+            if i < len(messages):
+                message = messages[i]
+            else:
+                commit_type = self._single_add_commit_type(file_name)
+                message = self._generate_realistic_commit_message(None, commit_type, i, structure)
+            if structure is not None:
+                self._advance_structure(structure, message)
+            plan.append((file_name, message, authors[i], times[i]))
+        return plan
+
+    def _create_commit(
+        self,
+        days_ago: int = 0,
+        commit_index: int = 0,
+        file_name: Optional[str] = None,
+        message: Optional[str] = None,
+        author: Optional[Actor] = None,
+        commit_time: Optional[int] = None
+    ) -> None:
+        """Create a commit with realistic message generation; author and time are drawn if not given."""
+        if author is None:
+            author = self._rng.choice(self.authors)
         
         # Generate commit timestamp
-        commit_time = datetime.now() - timedelta(
-            days=days_ago, 
-            hours=random.randint(0, 23), 
-            minutes=random.randint(0, 59)
-        )
-        commit_date = commit_time.strftime("%Y-%m-%dT%H:%M:%S")
+        if commit_time is None:
+            commit_time = self._generate_commit_time(days_ago)
+        commit_date = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(commit_time))
         
         # Always create a new file for each commit to ensure we have changes
-        file_name = self._generate_realistic_filename(commit_index)
-        dummy_path = Path(self.repo.working_dir) / file_name
-        
-        # Ensure the file doesn't already exist
-        counter = 1
-        while dummy_path.exists():
-            name, ext = os.path.splitext(file_name)
-            file_name = f"{name}_v{counter}{ext}"
-            dummy_path = Path(self.repo.working_dir) / file_name
-            counter += 1
-        
-        # Create realistic content
-        content = self._create_realistic_file_content(file_name, commit_index)
-        with open(dummy_path, 'w') as f:
-            f.write(content)
-        
-        # Stage the file
-        self.repo.git.add(file_name)
-        changes = {'added': [file_name], 'modified': [], 'deleted': [], 'renamed': []}
-        
-        # Generate realistic commit message
-        commit_type = self._generate_commit_type(changes)
-        message = self._generate_realistic_commit_message(changes, commit_type, commit_index)
-        
-        # Set environment for commit
-        env = os.environ.copy()
-        env["GIT_AUTHOR_DATE"] = commit_date
-        env["GIT_COMMITTER_DATE"] = commit_date
-        
-        # Create commit using git command to properly handle environment variables
-        self.repo.git.commit(
-            '-m', message,
-            '--author', f'{author.name} <{author.email}>',
-            env=env
+        file_name = file_name or self._generate_unique_filename(commit_index)
+        
+        # Create realistic content, written with one raw write instead of a buffered file object
+        data = self._create_realistic_file_content(file_name, commit_index).encode('utf-8')
+        fd = os.open(os.path.join(self._workdir, file_name), WRITE_FLAGS, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+        
+        # Generate realistic commit message; like the commits before it, the new file is part
+        # of the analysis
+        if message is None:
+            self.invalidate_structure_cache()
+            commit_type = self._single_add_commit_type(file_name)
+            message = self._generate_realistic_commit_message(None, commit_type, commit_index)
+        
+        # Stage and commit in-process: the blob is already hashed, so the index only has to
+        # record it, and both dates are passed to the commit instead of through git's environment
+        entries = self._store_blobs({file_name: data})
+        if self._index_readable():
+            when = datetime.fromtimestamp(commit_time, timezone.utc).astimezone()
+            index = self.repo.index
+            index.add(entries)
+            index.commit(message, author=author, author_date=when, commit_date=when)
+        else:
+            self._commit_with_git(entries, message, author, commit_date)
+        
+        self._log.append(f"Committed: {message} by {author.name} <{author.email}> at {commit_date}")
+
+    def _store_blobs(self, files: Dict[str, bytes]) -> List[BaseIndexEntry]:
+        """Write file contents as blobs in-process and return index entries recording them."""
+        entries = []
+        for path, data in files.items():
+            blob = self.repo.odb.store(IStream(b'blob', len(data), BytesIO(data)))
+            entries.append(BaseIndexEntry((0o100644, blob.binsha, 0, path)))
+        return entries
+
+    def _index_readable(self) -> bool:
+        """Check whether GitPython can parse the index file (a missing one counts as readable)."""
+        try:
+            with open(os.path.join(self.repo.git_dir, 'index'), 'rb') as f:
+                header = f.read(8)
+        except FileNotFoundError:
+            return True
+        return len(header) < 8 or int.from_bytes(header[4:], 'big') in GITPYTHON_INDEX_VERSIONS
+
+    def _commit_with_git(self, entries: List[BaseIndexEntry], message: str, author: Actor, commit_date: str) -> None:
+        """Record already-stored blobs and commit them through the git CLI, dated commit_date."""
+        # Both dates are overwritten every time, so the copy is reused
+        env = self._commit_env
+        env['GIT_AUTHOR_DATE'] = commit_date
+        env['GIT_COMMITTER_DATE'] = commit_date
+        index_info = b''.join(
+            b'%o %s\t%s\0' % (entry.mode, entry.hexsha.encode('ascii'), os.fsencode(entry.path))
+            for entry in entries
         )
+        self._run_git(['git', 'update-index', '-z', '--index-info'], input=index_info)
+        self._run_git(['git', 'commit', '-q', '-m', message, '--author', f'{author.name} <{author.email}>'], env=env)
+
+    def _can_fast_import(self) -> bool:
+        """Check whether HEAD is a branch fast-import can extend: one with history, or an unborn one with nothing staged."""
+        try:
+            head = self.repo.head
+            return not head.is_detached and (head.is_valid() or not self.repo.index.entries)
+        except Exception:
+            return False
+
+    def _create_commits_fast_import(self, plan: List[Tuple[str, str, Actor, int]]) -> None:
+        """Create all commits through a single git fast-import stream."""
+        committer = Actor.committer(self.repo.config_reader())
+        branch = self.repo.active_branch.name
+        old_head = self.repo.head.commit.hexsha if self.repo.head.is_valid() else None
+        
+        writer = FastImportWriter(self._repo_bytes, branch, parent=old_head)
+        # Closing the stream is what makes fast-import move the branch, so a run that fails
+        # part way (Ctrl-C included) kills it instead and leaves branch and index untouched;
+        # progress lines are only logged once the commits exist
+        committed = []
+        try:
+            for i, (file_name, message, author, commit_time) in enumerate(plan):
+                content = self._create_realistic_file_content(file_name, i)
+                writer.commit(message, author, committer, commit_time, {file_name: content.encode('utf-8')})
+                committed.append(f"Committed: {message} by {author.name} <{author.email}> at {time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(commit_time))}")
+        except BaseException:
+            writer.abort()
+            raise
+        writer.close()
+        self._log.extend(committed)
         
-        print(f"Committed: {message} by {author.name} <{author.email}> at {commit_date}")
+        # Bring the index and working tree up to date with the new branch tip
+        trees = [old_head, branch] if old_head else [branch]
+        self._run_git(['git', 'read-tree', '-m', '-u'] + trees)
+
+    def _run_git(
+        self,
+        cmd: List[str],
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        input: Optional[bytes] = None
+    ) -> None:
+        """Run one command in the repository (or cwd), raising GitCommandError if it fails."""
+        result = subprocess.run(cmd, cwd=cwd or self._repo_bytes, env=env, input=input, capture_output=True)
+        if result.returncode != 0:
+            raise GitCommandError(cmd, result.returncode, result.stderr, result.stdout)
 
     def _generate_realistic_filename(self, commit_index: int) -> str:
         """Generate realistic filenames based on commit context."""
-        if commit_index < 3:
-            # Initial setup files
-            files = ['setup.py', 'requirements.txt', 'README.md', 'config.py', 'main.py']
-        elif commit_index < 8:
-            # Core functionality files
-            files = ['app.py', 'models.py', 'utils.py', 'helpers.py', 'core.py']
-        elif commit_index < 12:
-            # API and database files
-            files = ['api.py', 'routes.py', 'database.py', 'schema.py', 'controllers.py']
-        elif commit_index < 15:
-            # Testing and documentation
-            files = ['test_app.py', 'test_models.py', 'docs.md', 'CHANGELOG.md', 'CONTRIBUTING.md']
-        else:
-            # Bug fixes and improvements
-            files = ['fix_auth.py', 'optimize_db.py', 'security.py', 'middleware.py', 'validation.py']
-        
-        base_file = random.choice(files)
+        name, ext = self._rng.choice(FILE_BUCKETS[bisect.bisect_right(FILE_BUCKET_LIMITS, commit_index)])
         
-        # Always make filename unique by adding commit index and timestamp
-        name, ext = os.path.splitext(base_file)
-        timestamp = datetime.now().strftime("%H%M%S")
-        return f"{name}_{commit_index}_{timestamp}{ext}"
+        # Always make filename unique by adding commit index and timestamp;
+        # the formatted time is reused for every file named within the same second
+        now = int(time.time())
+        if now != self._stamp_second:
+            self._stamp_second = now
+            self._stamp = time.strftime("%H%M%S", time.localtime(now))
+        return f"{name}_{commit_index}_{self._stamp}{ext}"
 
     def push_to_remote(self, remote: str = "origin", branch: str = "main") -> None:
         """Push changes to remote repository."""
@@ -921,53 +1535,66 @@ setting3 = value3
     def _cleanup_temp_files(self) -> None:
         """Remove all temporary files created during the forging process."""
         try:
-            # Get all files in the repository
-            all_files = []
-            for root, dirs, files in os.walk(self.repo.working_dir):
-                # Skip .git directory
-                if '.git' in root:
-                    continue
-                    
-                for file in files:
-                    file_path = os.path.relpath(os.path.join(root, file), self.repo.working_dir)
-                    all_files.append(file_path)
-            
-            # Find temporary files created by this tool
-            temp_files = []
-            for file_path in all_files:
-                # Check if it's a temporary file created by our tool
-                if any(pattern in file_path for pattern in [
-                    '_0_', '_1_', '_2_', '_3_', '_4_', '_5_', '_6_', '_7_', '_8_', '_9_',
-                    '_10_', '_11_', '_12_', '_13_', '_14_', '_15_', '_16_', '_17_', '_18_', '_19_',
-                    '_v1', '_v2', '_v3', '_v4', '_v5'
-                ]):
-                    temp_files.append(file_path)
-            
-            # Remove temporary files
-            for temp_file in temp_files:
+            # Only names this strategy generated are touched; ones already gone are skipped
+            removed = 0
+            for temp_file in sorted(self._issued_names):
                 try:
-                    file_path = Path(self.repo.working_dir) / temp_file
-                    if file_path.exists():
-                        file_path.unlink()
-                        print(f"Cleaned up: {temp_file}")
-                except Exception as e:
-                    print(f"Failed to remove {temp_file}: {e}")
+                    os.unlink(os.path.join(self._workdir, temp_file))
+                    self._log.append(f"Cleaned up: {temp_file}")
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    self._log.append(f"Failed to remove {temp_file}: {e}")
             
-            if temp_files:
-                print(f"Cleaned up {len(temp_files)} temporary files")
+            if removed:
+                self._log.append(f"Cleaned up {removed} temporary files")
             else:
-                print("No temporary files found to clean up")
+                self._log.append("No temporary files found to clean up")
                 
         except Exception as e:
-            print(f"Error during cleanup: {e}")
+            self._log.append(f"Error during cleanup: {e}")
 
-    def run(self, days_ago: int = 0, commits: int = 10, cleanup: bool = True) -> None:
-        """Run the git strategy to create commits."""
+    def run(
+        self,
+        days_ago: int = 0,
+        commits: int = 10,
+        cleanup: bool = True,
+        messages: Optional[List[str]] = None
+    ) -> None:
+        """Run the git strategy to create commits, using any precomputed messages first."""
+        self._base_epoch = int(time.time())
         try:
-            for i in range(commits):
-                self._create_commit(days_ago=days_ago, commit_index=i)
+            # Generate every message up front so the git loop does nothing but write commits
+            plan = self._generate_commit_plan(commits, messages, days_ago)
+            
+            # Batches go through one fast-import process instead of a git call per commit
+            if commits > self.config.get('fast_import_threshold', 0) and self._can_fast_import():
+                self._create_commits_fast_import(plan)
+            else:
+                for i, (file_name, message, author, commit_time) in enumerate(plan):
+                    self._create_commit(
+                        days_ago=days_ago,
+                        commit_index=i,
+                        file_name=file_name,
+                        message=message,
+                        author=author,
+                        commit_time=commit_time
+                    )
         finally:
             # Clean up temporary files after the process
             if cleanup:
                 self._cleanup_temp_files()
+            # The new commits change what the analysis would see next time
+            self.invalidate_structure_cache()
+            # Stop the persistent cat-file processes used for object lookups
+            self.repo.git.clear_cache()
+            self._flush_log()
+
+    def _flush_log(self) -> None:
+        """Write the buffered progress lines to stdout with a single write."""
+        if self._log:
+            sys.stdout.write('\n'.join(self._log) + '\n')
+            sys.stdout.flush()
+            self._log.clear()
 